@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Union
+from typing import List, Literal, Union
 from pydantic import field_validator
 import os
 
@@ -11,6 +11,30 @@ class Settings(BaseSettings):
     cors_origins: Union[List[str], str] = "http://localhost:5173,http://localhost:3000"
     environment: str = "development"
     debug: bool = True
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    preload_app: bool = True
+    graceful_shutdown_timeout: int = 30
+    job_drain_timeout: int = 10
+    health_check_interval_seconds: float = 5.0
+    database_retry_seconds: float = 5.0
+    job_scheduler_enabled: bool = True
+    job_executor: Literal["thread", "process"] = "thread"
+    job_workers: int = 4
+    job_max_concurrency_per_user: int = 2
+    job_max_attempts: int = 3
+    job_retry_backoff_seconds: float = 5.0
+    job_retry_backoff_max_seconds: float = 300.0
+    job_poll_interval_seconds: float = 1.0
+    job_stale_after_seconds: int = 120
+    job_heartbeat_seconds: float = 30.0
+    smtp_host: str = ""
+    smtp_port: int = 587
+    smtp_username: str = ""
+    smtp_password: str = ""
+    smtp_from: str = ""
+    smtp_use_tls: bool = True
 
     @field_validator('cors_origins', mode='before')
     @classmethod
@@ -1,9 +1,12 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from models import User, Project, File
-from schemas import UserCreate, ProjectCreate, FileCreate, FileUpdate
+from models import User, Project, File, Job
+from schemas import UserCreate, ProjectCreate, FileCreate, FileUpdate, JobCreate
 from auth import get_password_hash, verify_password
-from typing import Optional, List
+from job_handlers import runnable_job_nodes
+from datetime import timedelta
+from typing import Optional, List, Dict, Any
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
@@ -152,4 +155,236 @@ def delete_file(db: Session, file_id: str, project_id: str) -> bool:
     
     db.delete(file)
     db.commit()
-    return True
\ No newline at end of file
+    return True
+
+def get_job_by_id(db: Session, job_id: int, project_id: str) -> Optional[Job]:
+    return db.query(Job).filter(Job.id == job_id, Job.project_id == project_id).first()
+
+def get_jobs_by_project(db: Session, project_id: str, status: Optional[str] = None) -> List[Job]:
+    query = db.query(Job).filter(Job.project_id == project_id)
+    if status is not None:
+        query = query.filter(Job.status == status)
+    return query.order_by(Job.created_at.desc()).all()
+
+def create_job(db: Session, job: JobCreate, project_id: str, user_id: int, max_attempts: int) -> Job:
+    name = job.name
+    payload = job.payload
+    if job.file_id is not None:
+        file = get_file_by_id(db, job.file_id, project_id)
+        if not file:
+            raise ValueError("Job file not found")
+        name = name or file.name
+        payload = payload if payload is not None else file.content
+
+    runnable_job_nodes(payload)
+
+    db_job = Job(
+        name=name or "New Job",
+        type=job.type,
+        status="pending",
+        priority=job.priority,
+        max_attempts=job.max_attempts if job.max_attempts is not None else max_attempts,
+        payload=payload,
+        file_id=job.file_id,
+        project_id=project_id,
+        user_id=user_id
+    )
+    
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+def retry_job(db: Session, job_id: int, project_id: str) -> Optional[Job]:
+    job = get_job_by_id(db, job_id, project_id)
+    if not job:
+        return None
+    if job.status != "failed":
+        raise ValueError("Only failed jobs can be retried")
+    runnable_job_nodes(job.payload)
+    
+    job.status = "pending"
+    job.attempts = 0
+    job.progress = 0
+    job.error = None
+    job.available_at = func.now()
+    db.commit()
+    db.refresh(job)
+    return job
+
+def delete_job(db: Session, job_id: int, project_id: str) -> bool:
+    job = get_job_by_id(db, job_id, project_id)
+    if not job:
+        return False
+    if job.status == "running":
+        raise ValueError("Running jobs cannot be deleted")
+    
+    db.delete(job)
+    db.commit()
+    return True
+
+def claim_next_job(db: Session, max_per_user: int, owner: str) -> Optional[Job]:
+    """Atomically move the highest-priority due job to running, skipping users at their limit.
+
+    The owning user's row is locked while their running jobs are counted, so concurrent
+    schedulers in other processes cannot both claim past max_per_user.
+    """
+    busy_users = set()
+    while True:
+        query = db.query(Job).filter(Job.status == "pending", Job.available_at <= func.now())
+        if busy_users:
+            query = query.filter(Job.user_id.notin_(busy_users))
+        job = (
+            query.order_by(Job.priority.desc(), Job.available_at, Job.id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if not job:
+            db.rollback()
+            return None
+        
+        db.query(User.id).filter(User.id == job.user_id).with_for_update().one()
+        running = (
+            db.query(func.count(Job.id))
+            .filter(Job.user_id == job.user_id, Job.status == "running")
+            .scalar()
+        )
+        if running < max_per_user:
+            break
+        busy_users.add(job.user_id)
+    
+    job.status = "running"
+    job.attempts += 1
+    job.progress = 0
+    job.locked_by = owner
+    job.heartbeat_at = func.now()
+    if job.first_started_at is None:
+        job.first_started_at = func.now()
+    job.started_at = func.now()
+    job.completed_at = None
+    db.commit()
+    db.refresh(job)
+    return job
+
+def heartbeat_job(db: Session, job_id: int, owner: str) -> bool:
+    """Extend the lease of a running job held by owner"""
+    count = (
+        db.query(Job)
+        .filter(Job.id == job_id, Job.status == "running", Job.locked_by == owner)
+        .update({Job.heartbeat_at: func.now()}, synchronize_session=False)
+    )
+    db.commit()
+    return count > 0
+
+def _leased_job(db: Session, job_id: int, owner: str):
+    return db.query(Job).filter(Job.id == job_id, Job.status == "running", Job.locked_by == owner)
+
+def update_job_progress(db: Session, job_id: int, owner: str, progress: int) -> bool:
+    """Record progress and renew the lease; False means owner no longer holds the job"""
+    count = _leased_job(db, job_id, owner).update({
+        Job.progress: max(0, min(100, progress)),
+        Job.heartbeat_at: func.now()
+    }, synchronize_session=False)
+    db.commit()
+    return count > 0
+
+def complete_job(db: Session, job_id: int, owner: str, result: Optional[Dict[str, Any]], run_seconds: float) -> bool:
+    count = _leased_job(db, job_id, owner).update({
+        Job.status: "completed",
+        Job.locked_by: None,
+        Job.run_seconds: Job.run_seconds + run_seconds,
+        Job.progress: 100,
+        Job.result: result,
+        Job.error: None,
+        Job.completed_at: func.now()
+    }, synchronize_session=False)
+    db.commit()
+    return count > 0
+
+def fail_job(db: Session, job: Job, owner: str, error: str, retry_delay: Optional[float], run_seconds: float) -> Optional[str]:
+    """Requeue the job after retry_delay seconds, or mark it failed when retry_delay is None.
+
+    Returns the new status, or None if owner no longer holds the job.
+    """
+    values = {
+        Job.error: error,
+        Job.locked_by: None,
+        Job.run_seconds: Job.run_seconds + run_seconds
+    }
+    if retry_delay is not None and job.attempts < job.max_attempts:
+        status = "pending"
+        values[Job.available_at] = func.now() + timedelta(seconds=retry_delay)
+    else:
+        status = "failed"
+        values[Job.completed_at] = func.now()
+    values[Job.status] = status
+    
+    count = _leased_job(db, job.id, owner).update(values, synchronize_session=False)
+    db.commit()
+    return status if count > 0 else None
+
+def requeue_stale_jobs(db: Session, stale_after_seconds: int) -> int:
+    """Release running jobs whose lease was not renewed, e.g. because their process died"""
+    expired = (
+        Job.status == "running",
+        Job.heartbeat_at < func.now() - timedelta(seconds=stale_after_seconds)
+    )
+    failed = (
+        db.query(Job)
+        .filter(*expired, Job.attempts >= Job.max_attempts)
+        .update({
+            Job.status: "failed",
+            Job.locked_by: None,
+            Job.error: "Job lease expired",
+            Job.completed_at: func.now()
+        }, synchronize_session=False)
+    )
+    requeued = (
+        db.query(Job)
+        .filter(*expired)
+        .update({
+            Job.status: "pending",
+            Job.locked_by: None,
+            Job.available_at: func.now()
+        }, synchronize_session=False)
+    )
+    db.commit()
+    return failed + requeued
+
+def get_job_metrics(db: Session, project_id: str, window_seconds: int) -> Dict[str, Any]:
+    counts = {status: 0 for status in ("pending", "running", "completed", "failed")}
+    for status, count in (
+        db.query(Job.status, func.count(Job.id))
+        .filter(Job.project_id == project_id)
+        .group_by(Job.status)
+        .all()
+    ):
+        counts[status] = count
+    
+    finished = (
+        db.query(Job)
+        .filter(
+            Job.project_id == project_id,
+            Job.status.in_(("completed", "failed")),
+            Job.completed_at >= func.now() - timedelta(seconds=window_seconds)
+        )
+        .all()
+    )
+    completed = sum(1 for job in finished if job.status == "completed")
+    
+    latencies = sorted(
+        (job.first_started_at - job.created_at).total_seconds()
+        for job in finished if job.first_started_at and job.created_at
+    )
+    run_times = [job.run_seconds for job in finished if job.first_started_at]
+    
+    return {
+        "window_seconds": window_seconds,
+        "counts": counts,
+        "completed": completed,
+        "failed": len(finished) - completed,
+        "throughput_per_minute": len(finished) * 60 / window_seconds,
+        "avg_queue_latency_seconds": sum(latencies) / len(latencies) if latencies else None,
+        "p95_queue_latency_seconds": latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+        "avg_run_seconds": sum(run_times) / len(run_times) if run_times else None,
+    }
@@ -1,7 +1,9 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import settings
+import os
+import threading
 
 database_url = settings.database_url
 if database_url.startswith("postgresql://"):
@@ -31,17 +33,63 @@ connect_args = {}
 if "sslmode=require" in settings.database_url:
     connect_args = {"ssl_context": True}
 
-engine = create_engine(database_url_cleaned, connect_args=connect_args)
+_engine = None
+_engine_lock = threading.Lock()
+_schema_ready = os.getenv("WIDGET_SCHEMA_READY") == "1"
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
 metadata = MetaData()
 
+def get_engine():
+    """Create the engine on first use so importing this module never opens a connection"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(database_url_cleaned, connect_args=connect_args, pool_pre_ping=True)
+                SessionLocal.configure(bind=_engine)
+    return _engine
+
+def dispose_engine():
+    """Close pooled connections, e.g. on worker shutdown"""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+def reset_engine_after_fork():
+    """Forget a pool inherited from the parent process without closing its sockets"""
+    global _engine, _engine_lock
+    _engine_lock = threading.Lock()
+    if _engine is not None:
+        _engine.dispose(close=False)
+        _engine = None
+
+def init_db():
+    """Create missing tables once per process tree; forked and spawned workers inherit the flag"""
+    global _schema_ready
+    if not _schema_ready:
+        Base.metadata.create_all(bind=get_engine())
+        _schema_ready = True
+        os.environ["WIDGET_SCHEMA_READY"] = "1"
+
+def check_database() -> bool:
+    """Return True if the database answers a trivial query"""
+    try:
+        with get_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
+
 def get_db():
+    get_engine()
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,134 @@
+import smtplib
+import time
+from email.message import EmailMessage
+from typing import Any, Callable, Dict, List, Optional
+
+from config import settings
+
+JobNodeHandler = Callable[[Dict[str, Any], Callable[[float], None]], Any]
+
+job_node_handlers: Dict[str, JobNodeHandler] = {}
+job_node_checks: Dict[str, Callable[[], Optional[str]]] = {}
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job cannot help"""
+
+def job_node_handler(node_type: str, check: Optional[Callable[[], Optional[str]]] = None):
+    """Register a function that executes job graph nodes of the given nodeType.
+
+    check returns an error message when the handler cannot run in this deployment,
+    so such jobs are rejected at enqueue time instead of failing in the worker.
+    """
+    def decorator(func: JobNodeHandler) -> JobNodeHandler:
+        job_node_handlers[node_type] = func
+        if check is not None:
+            job_node_checks[node_type] = check
+        return func
+    return decorator
+
+@job_node_handler("start")
+def _start(properties: Dict[str, Any], report: Callable[[float], None]):
+    return None
+
+@job_node_handler("delay")
+def _delay(properties: Dict[str, Any], report: Callable[[float], None]):
+    seconds = float(properties.get("seconds", 1))
+    time.sleep(seconds)
+    return {"slept": seconds}
+
+def _smtp_configured() -> Optional[str]:
+    if not settings.smtp_host or not settings.smtp_from:
+        return "Email nodes require SMTP_HOST and SMTP_FROM to be configured"
+    return None
+
+@job_node_handler("email", check=_smtp_configured)
+def _email(properties: Dict[str, Any], report: Callable[[float], None]):
+    if not properties.get("to"):
+        raise PermanentJobError("Email node has no recipient")
+
+    message = EmailMessage()
+    message["From"] = settings.smtp_from
+    message["To"] = properties["to"]
+    message["Subject"] = properties.get("subject", "")
+    message.set_content(properties.get("body", ""))
+
+    with smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=30) as smtp:
+        if settings.smtp_use_tls:
+            smtp.starttls()
+        if settings.smtp_username:
+            smtp.login(settings.smtp_username, settings.smtp_password)
+        smtp.send_message(message)
+    return {"success": True}
+
+def _is_exec_edge(edge: Dict[str, Any]) -> bool:
+    return edge.get("sourceHandle", "exec-out") == "exec-out" and edge.get("targetHandle", "exec-in") == "exec-in"
+
+def _validate_graph(payload: Any):
+    """Raise ValueError unless payload has the shape the job editor saves"""
+    if not isinstance(payload, dict):
+        raise ValueError("Job payload must be an object")
+    nodes = payload.get("nodes", [])
+    edges = payload.get("edges", [])
+    if not isinstance(nodes, list) or not isinstance(edges, list):
+        raise ValueError("Job nodes and edges must be lists")
+
+    node_ids = set()
+    for node in nodes:
+        if not isinstance(node, dict) or not isinstance(node.get("id"), str):
+            raise ValueError("Every job node must be an object with a string id")
+        if node["id"] in node_ids:
+            raise ValueError(f"Duplicate node id '{node['id']}'")
+        node_ids.add(node["id"])
+        data = node.get("data", {})
+        if not isinstance(data, dict):
+            raise ValueError(f"Node '{node['id']}' data must be an object")
+        if not isinstance(data.get("properties", {}), dict):
+            raise ValueError(f"Node '{node['id']}' properties must be an object")
+
+    exec_sources = set()
+    for edge in edges:
+        if not isinstance(edge, dict) or not isinstance(edge.get("source"), str) or not isinstance(edge.get("target"), str):
+            raise ValueError("Every job edge must be an object with string source and target")
+        if _is_exec_edge(edge):
+            if edge["source"] in exec_sources:
+                raise ValueError(f"Node '{edge['source']}' has more than one execution output; branching is not supported")
+            exec_sources.add(edge["source"])
+
+def ordered_job_nodes(payload: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Follow the execution edges of a .job graph from its entry nodes"""
+    if not payload:
+        return []
+    _validate_graph(payload)
+    nodes = {node["id"]: node for node in payload.get("nodes", [])}
+    next_node = {}
+    targets = set()
+    for edge in payload.get("edges", []):
+        if _is_exec_edge(edge):
+            next_node[edge["source"]] = edge["target"]
+            targets.add(edge["target"])
+
+    ordered = []
+    seen = set()
+    for node_id in nodes:
+        if node_id in targets:
+            continue
+        while node_id in nodes and node_id not in seen:
+            seen.add(node_id)
+            ordered.append(nodes[node_id])
+            node_id = next_node.get(node_id)
+    return ordered
+
+def runnable_job_nodes(payload: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the nodes a job will execute, raising ValueError if it cannot run"""
+    nodes = ordered_job_nodes(payload)
+    if not nodes:
+        raise ValueError("Job has no runnable nodes")
+    for node in nodes:
+        node_type = node.get("data", {}).get("nodeType")
+        if node_type not in job_node_handlers:
+            raise ValueError(f"Unsupported node type '{node_type}'")
+        check = job_node_checks.get(node_type)
+        error = check() if check is not None else None
+        if error:
+            raise ValueError(error)
+    return nodes
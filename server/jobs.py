@@ -0,0 +1,281 @@
+import asyncio
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Optional
+
+from config import settings
+from database import SessionLocal, get_engine, reset_engine_after_fork
+from job_handlers import PermanentJobError, job_node_handlers, runnable_job_nodes
+from models import Job
+import crud
+
+def retry_delay(attempts: int) -> float:
+    delay = settings.job_retry_backoff_seconds * (2 ** max(attempts - 1, 0))
+    return min(delay, settings.job_retry_backoff_max_seconds)
+
+def worker_id() -> str:
+    """Identify the executing process in job leases"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class LeaseLostError(Exception):
+    """Raised inside a running job once another worker may have taken it over"""
+
+class _Heartbeat(threading.Thread):
+    """Keeps a running job's lease fresh while a handler is busy, using its own session"""
+
+    def __init__(self, job_id: int, owner: str):
+        super().__init__(name=f"job-heartbeat-{job_id}", daemon=True)
+        self.job_id = job_id
+        self.owner = owner
+        self.lost = threading.Event()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(settings.job_heartbeat_seconds):
+            db = SessionLocal()
+            try:
+                if not crud.heartbeat_job(db, self.job_id, self.owner):
+                    self.lost.set()
+                    return
+            except Exception as e:
+                print(f"⚠️  Heartbeat for job {self.job_id} failed: {e}")
+            finally:
+                db.close()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def _report_progress(db, job_id: int, owner: str, heartbeat: _Heartbeat, progress: int):
+    if heartbeat.lost.is_set() or not crud.update_job_progress(db, job_id, owner, progress):
+        raise LeaseLostError(f"Lease on job {job_id} was lost")
+
+def _settle(db, job: Job, owner: str, error: Optional[str], results, retryable: bool, run_seconds: float) -> str:
+    """Move the job out of running; if the intended write fails, fall back to a retryable failure"""
+    try:
+        if error is None:
+            status = "completed" if crud.complete_job(db, job.id, owner, results, run_seconds) else None
+        else:
+            status = crud.fail_job(db, job, owner, error, retry_delay(job.attempts) if retryable else None, run_seconds)
+        return status or "lease lost"
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️  Could not record outcome of job {job.id}: {e}")
+        reason = f"Could not record job outcome ({type(getattr(e, 'orig', None) or e).__name__})"
+        if error is not None:
+            reason = f"{reason}: {error}"
+    try:
+        return crud.fail_job(db, job, owner, reason, retry_delay(job.attempts), run_seconds) or "lease lost"
+    except Exception as e:
+        db.rollback()
+        print(f"⚠️  Job {job.id} left to lease expiry: {e}")
+        return "running"
+
+def execute_job(job_id: int, owner: str) -> str:
+    """Run a claimed job to completion; this is what the pool executes.
+
+    Every write is conditional on owner still holding the job's lease. Once the lease is
+    lost the job stops at its next progress report and leaves the row to the new owner.
+    """
+    get_engine()
+    db = SessionLocal()
+    heartbeat = None
+    try:
+        job = db.query(Job).filter(Job.id == job_id, Job.locked_by == owner).first()
+        if not job:
+            return "missing"
+
+        heartbeat = _Heartbeat(job_id, owner)
+        heartbeat.start()
+
+        started = time.monotonic()
+        results = {}
+        error = None
+        retryable = True
+        try:
+            try:
+                nodes = runnable_job_nodes(job.payload)
+            except ValueError as e:
+                raise PermanentJobError(str(e))
+
+            for index, node in enumerate(nodes):
+                data = node.get("data", {})
+                handler = job_node_handlers[data["nodeType"]]
+
+                def report(fraction: float, index=index):
+                    _report_progress(db, job_id, owner, heartbeat, int((index + fraction) * 100 / len(nodes)))
+
+                results[node["id"]] = handler(data.get("properties") or {}, report)
+                _report_progress(db, job_id, owner, heartbeat, int((index + 1) * 100 / len(nodes)))
+        except LeaseLostError as e:
+            db.rollback()
+            print(f"⚠️  {e}, abandoning it")
+            return "lease lost"
+        except PermanentJobError as e:
+            db.rollback()
+            error, retryable = str(e), False
+        except Exception as e:
+            db.rollback()
+            error = f"{type(e).__name__}: {e}"
+
+        return _settle(db, job, owner, error, results, retryable, time.monotonic() - started)
+    finally:
+        if heartbeat is not None:
+            heartbeat.stop()
+        db.close()
+
+class JobScheduler:
+    """Claims due jobs from the database and runs up to JOB_WORKERS of them at once.
+
+    Claims use SELECT ... FOR UPDATE SKIP LOCKED and lock the owning user's row while
+    counting their running jobs, so every server worker can run its own scheduler against
+    the same queue without exceeding the per-user limit. Thread mode runs each job on a
+    daemon thread and process mode on a multiprocessing pool, so neither keeps the server
+    alive past its shutdown budget; jobs still running then are recovered via their lease.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._running: set = set()
+        self._stopping = False
+        self._next_requeue = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return settings.job_workers
+
+    def notify(self):
+        """Check the queue now instead of waiting for the next poll"""
+        if self._wake is not None:
+            self._wake.set()
+
+    def request_stop(self):
+        """Stop claiming new jobs; safe to call from a signal handler"""
+        self._stopping = True
+
+    async def start(self):
+        if settings.job_executor == "process":
+            self._pool = multiprocessing.Pool(processes=self.capacity, initializer=reset_engine_after_fork)
+
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        print(f"🧵 Job scheduler: {self.capacity} {settings.job_executor} worker(s)")
+
+    async def stop(self, timeout: float):
+        """Wait up to timeout for running jobs, then abandon the rest to lease recovery"""
+        self._stopping = True
+        self.notify()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+        pending = set()
+        if self._running:
+            _, pending = await asyncio.wait(self._running, timeout=timeout)
+        if pending:
+            print(f"⏹️  Leaving {len(pending)} running job(s) to lease recovery")
+
+        if self._pool is not None:
+            if pending:
+                self._pool.terminate()
+            else:
+                self._pool.close()
+                self._pool.join()
+            self._pool = None
+
+    def _submit(self, job_id: int, owner: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve(result, error):
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        def finish(result=None, error=None):
+            try:
+                loop.call_soon_threadsafe(resolve, result, error)
+            except RuntimeError:
+                pass
+
+        if self._pool is not None:
+            self._pool.apply_async(
+                execute_job, (job_id, owner),
+                callback=finish,
+                error_callback=lambda error: finish(error=error)
+            )
+        else:
+            def run():
+                try:
+                    finish(execute_job(job_id, owner))
+                except Exception as e:
+                    finish(error=e)
+
+            threading.Thread(target=run, name=f"job-{job_id}", daemon=True).start()
+        return future
+
+    async def _run(self):
+        while not self._stopping:
+            if time.monotonic() >= self._next_requeue:
+                self._next_requeue = time.monotonic() + settings.job_heartbeat_seconds
+                try:
+                    requeued = await asyncio.to_thread(self._requeue_stale)
+                    if requeued:
+                        print(f"♻️  Requeued {requeued} job(s) with expired leases")
+                except Exception as e:
+                    print(f"⚠️  Job scheduler could not requeue stale jobs: {e}")
+
+            while len(self._running) < self.capacity and not self._stopping:
+                try:
+                    claim = await asyncio.to_thread(self._claim)
+                except Exception as e:
+                    print(f"⚠️  Job scheduler could not claim a job: {e}")
+                    claim = None
+                if claim is None:
+                    break
+                future = self._submit(*claim)
+                self._running.add(future)
+                future.add_done_callback(self._on_done)
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=settings.job_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def _on_done(self, future):
+        self._running.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            print(f"⚠️  Job execution crashed: {future.exception()}")
+        self.notify()
+
+    def _claim(self):
+        """Claim one job under a lease owner unique to this process and claim"""
+        owner = f"{worker_id()}:{uuid.uuid4().hex[:8]}"
+        get_engine()
+        db = SessionLocal()
+        try:
+            job = crud.claim_next_job(db, settings.job_max_concurrency_per_user, owner)
+            return (job.id, owner) if job else None
+        finally:
+            db.close()
+
+    def _requeue_stale(self) -> int:
+        get_engine()
+        db = SessionLocal()
+        try:
+            return crud.requeue_stale_jobs(db, settings.job_stale_after_seconds)
+        finally:
+            db.close()
+
+scheduler = JobScheduler()
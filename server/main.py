@@ -1,27 +1,133 @@
+import time
+
+_process_started = time.perf_counter()
+
+import asyncio
+import signal
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from config import settings
-from database import get_db, engine
-from models import Base, User
+from database import get_db, init_db, dispose_engine, check_database
+from models import User
 from schemas import (
     UserCreate, UserLogin, UserResponse, AuthResponse, Token,
     ProjectCreate, ProjectResponse, ProjectWithFilesResponse,
-    FileCreate, FileUpdate, FileResponse
+    FileCreate, FileUpdate, FileResponse,
+    JobCreate, JobResponse, JobMetricsResponse
 )
 from auth import create_access_token, verify_token
+from jobs import scheduler
 import crud
 
-Base.metadata.create_all(bind=engine)
+server_state = {
+    "ready": False,
+    "draining": False,
+    "in_flight": 0,
+    "startup_seconds": None,
+}
+
+_database_status = {
+    "ok": False,
+    "checked_at": None,
+    "checking": False,
+}
+
+async def _database_ok() -> bool:
+    """Probe the DB at most once per interval and never from more than one probe at a time.
+
+    Concurrent probes get the last known status instead of each tying up a thread on a DB
+    that has stopped answering.
+    """
+    checked_at = _database_status["checked_at"]
+    due = checked_at is None or time.monotonic() - checked_at >= settings.health_check_interval_seconds
+    if due and not _database_status["checking"]:
+        _database_status["checking"] = True
+        try:
+            _database_status["ok"] = await asyncio.to_thread(check_database)
+            _database_status["checked_at"] = time.monotonic()
+        finally:
+            _database_status["checking"] = False
+    return _database_status["ok"]
+
+def reset_startup_clock():
+    """Measure startup from this process, not from the preloading parent it was forked from"""
+    global _process_started
+    _process_started = time.perf_counter()
+
+def _mark_draining_on_sigterm():
+    """Flip readiness off as soon as SIGTERM arrives, then let the server drain as usual"""
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handler(signum, frame):
+        server_state["draining"] = True
+        scheduler.request_stop()
+        if callable(previous):
+            previous(signum, frame)
+
+    try:
+        signal.signal(signal.SIGTERM, handler)
+    except ValueError:
+        pass
+
+async def _initialize():
+    """Bring up the schema and job scheduler without blocking health probes; retry while the DB is down"""
+    retry_seconds = settings.database_retry_seconds
+    while True:
+        try:
+            await asyncio.to_thread(init_db)
+            break
+        except Exception as e:
+            print(f"⚠️  Database not ready ({type(e).__name__}: {e}), retrying in {retry_seconds:g}s")
+            await asyncio.sleep(retry_seconds)
+
+    if settings.job_scheduler_enabled:
+        await scheduler.start()
+
+    server_state["startup_seconds"] = time.perf_counter() - _process_started
+    server_state["ready"] = True
+    print(f"⏱️  Ready in {server_state['startup_seconds'] * 1000:.0f} ms")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _mark_draining_on_sigterm()
+
+    print(f"🚀 Starting Widget API in {settings.environment.upper()} mode")
+    print(f"🔐 Debug mode: {settings.debug}")
+    print(f"🌐 CORS origins: {settings.cors_origins}")
+    if settings.is_development:
+        print(f"🗄️  Database: Development (Neon)")
+    else:
+        print(f"🗄️  Database: Production (Neon)")
+
+    initialize = asyncio.create_task(_initialize())
+
+    yield
+
+    server_state["ready"] = False
+    server_state["draining"] = True
+    print(f"🛑 Shutting down with {server_state['in_flight']} request(s) still in flight")
+    if not initialize.done():
+        initialize.cancel()
+        try:
+            await initialize
+        except asyncio.CancelledError:
+            pass
+    if settings.job_scheduler_enabled:
+        await scheduler.stop(timeout=settings.job_drain_timeout)
+    dispose_engine()
 
 app = FastAPI(
     title="Widget Authentication API",
     description="Authentication backend for Widget app using Neon database",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -32,13 +138,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-print(f"🚀 Starting Widget API in {settings.environment.upper()} mode")
-print(f"🔐 Debug mode: {settings.debug}")
-print(f"🌐 CORS origins: {settings.cors_origins}")
-if settings.is_development:
-    print(f"🗄️  Database: Development (Neon)")
-else:
-    print(f"🗄️  Database: Production (Neon)")
+@app.middleware("http")
+async def track_in_flight(request: Request, call_next):
+    server_state["in_flight"] += 1
+    try:
+        return await call_next(request)
+    finally:
+        server_state["in_flight"] -= 1
 
 security = HTTPBearer()
 
@@ -70,6 +176,25 @@ async def get_current_user(
 async def root():
     return {"message": "Widget Authentication API is running!"}
 
+@app.get("/api/health/live")
+async def liveness():
+    return {"status": "alive"}
+
+@app.get("/api/health/ready")
+async def readiness():
+    database_ok = await _database_ok()
+    ready = server_state["ready"] and not server_state["draining"] and database_ok
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "status": "ready" if ready else "unavailable",
+            "database": database_ok,
+            "draining": server_state["draining"],
+            "in_flight": server_state["in_flight"],
+            "startup_seconds": server_state["startup_seconds"],
+        }
+    )
+
 @app.get("/api/test")
 async def test_endpoint():
     return {"message": "Test endpoint working!"}
@@ -293,6 +418,107 @@ async def delete_file(
         raise HTTPException(status_code=404, detail="File not found")
     return {"message": "File deleted successfully"}
 
+@app.post("/api/projects/{project_id}/jobs", response_model=JobResponse)
+async def create_job(
+    project_id: str,
+    job: JobCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    project = crud.get_project_by_id(db, project_id, current_user.id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    try:
+        db_job = crud.create_job(db, job, project_id, current_user.id, settings.job_max_attempts)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    scheduler.notify()
+    return db_job
+
+@app.get("/api/projects/{project_id}/jobs", response_model=List[JobResponse])
+async def get_jobs(
+    project_id: str,
+    status: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    project = crud.get_project_by_id(db, project_id, current_user.id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    return crud.get_jobs_by_project(db, project_id, status)
+
+@app.get("/api/projects/{project_id}/jobs/metrics", response_model=JobMetricsResponse)
+async def get_job_metrics(
+    project_id: str,
+    window_seconds: int = 3600,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    project = crud.get_project_by_id(db, project_id, current_user.id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if window_seconds <= 0:
+        raise HTTPException(status_code=400, detail="window_seconds must be positive")
+    
+    return crud.get_job_metrics(db, project_id, window_seconds)
+
+@app.get("/api/projects/{project_id}/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    project_id: str,
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    project = crud.get_project_by_id(db, project_id, current_user.id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    job = crud.get_job_by_id(db, job_id, project_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.post("/api/projects/{project_id}/jobs/{job_id}/retry", response_model=JobResponse)
+async def retry_job(
+    project_id: str,
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    project = crud.get_project_by_id(db, project_id, current_user.id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    try:
+        job = crud.retry_job(db, job_id, project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    scheduler.notify()
+    return job
+
+@app.delete("/api/projects/{project_id}/jobs/{job_id}")
+async def delete_job(
+    project_id: str,
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    project = crud.get_project_by_id(db, project_id, current_user.id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    try:
+        success = crud.delete_job(db, job_id, project_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not success:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"message": "Job deleted successfully"}
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host=settings.host, port=settings.port)
\ No newline at end of file
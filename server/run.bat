@@ -1,4 +1,4 @@
 @echo off
 echo Starting Widget API in PRODUCTION mode...
 set ENVIRONMENT=production
-python main.py
\ No newline at end of file
+python serve.py
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, Field
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
@@ -69,4 +69,45 @@ class FileResponse(FileBase):
     updated_at: datetime
 
 class ProjectWithFilesResponse(ProjectResponse):
-    files: List[FileResponse]
\ No newline at end of file
+    files: List[FileResponse]
+
+class JobCreate(BaseModel):
+    name: Optional[str] = None
+    type: str = "custom"
+    file_id: Optional[str] = None
+    payload: Optional[Dict[str, Any]] = None
+    priority: int = Field(default=0, ge=-100, le=100)
+    max_attempts: Optional[int] = Field(default=None, ge=1, le=20)
+
+class JobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    name: str
+    type: str
+    status: str
+    priority: int
+    progress: int
+    attempts: int
+    max_attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    file_id: Optional[str] = None
+    project_id: str
+    run_seconds: float
+    available_at: Optional[datetime] = None
+    first_started_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+class JobMetricsResponse(BaseModel):
+    window_seconds: int
+    counts: Dict[str, int]
+    completed: int
+    failed: int
+    throughput_per_minute: float
+    avg_queue_latency_seconds: Optional[float] = None
+    p95_queue_latency_seconds: Optional[float] = None
+    avg_run_seconds: Optional[float] = None
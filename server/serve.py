@@ -0,0 +1,108 @@
+import argparse
+import importlib.util
+import time
+
+from config import settings
+
+def _fast_loop_and_http():
+    """uvicorn picks these up with loop/http="auto"; report what is actually available"""
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="Run the Widget API server")
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--workers", type=int, default=settings.workers)
+    parser.add_argument("--preload", dest="preload", action="store_true", default=settings.preload_app)
+    parser.add_argument("--no-preload", dest="preload", action="store_false")
+    parser.add_argument("--graceful-timeout", type=int, default=settings.graceful_shutdown_timeout)
+    return parser.parse_args()
+
+def _http_drain_timeout(args) -> int:
+    """Split the shutdown budget: HTTP requests drain first, then JOB_DRAIN_TIMEOUT for running jobs"""
+    return max(args.graceful_timeout - settings.job_drain_timeout, 1)
+
+def _prepare_database():
+    """Create tables once before any worker starts; workers retry on their own if this fails"""
+    from database import init_db, dispose_engine
+    started = time.perf_counter()
+    try:
+        init_db()
+        print(f"🗄️  Schema ready in {(time.perf_counter() - started) * 1000:.0f} ms")
+    except Exception as e:
+        print(f"⚠️  Could not prepare database ({type(e).__name__}: {e}), workers will retry")
+    finally:
+        dispose_engine()
+
+def _preload():
+    """Import the app in the parent so forked workers start from a warm interpreter"""
+    started = time.perf_counter()
+    from main import app
+    print(f"📦 Preloaded app in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return app
+
+def _post_fork(server, worker):
+    from main import reset_startup_clock
+    reset_startup_clock()
+
+def _run_gunicorn(args, app):
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.workers import UvicornWorker
+
+    class WidgetUvicornWorker(UvicornWorker):
+        CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "timeout_graceful_shutdown": _http_drain_timeout(args)}
+
+    class WidgetApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{args.host}:{args.port}")
+            self.cfg.set("workers", args.workers)
+            self.cfg.set("worker_class", WidgetUvicornWorker)
+            self.cfg.set("preload_app", True)
+            self.cfg.set("graceful_timeout", args.graceful_timeout)
+            self.cfg.set("post_fork", _post_fork)
+
+        def load(self):
+            return app
+
+    WidgetApplication().run()
+
+def main():
+    args = _parse_args()
+    loop, http = _fast_loop_and_http()
+    print(f"⚙️  Workers: {args.workers}, preload: {args.preload}, loop: {loop}, http: {http}")
+
+    import uvicorn
+
+    _prepare_database()
+
+    if args.workers > 1 and args.preload and importlib.util.find_spec("gunicorn"):
+        _run_gunicorn(args, _preload())
+        return
+
+    if args.workers > 1:
+        if args.preload:
+            print("⚠️  gunicorn not available, workers will each import the app")
+        uvicorn.run(
+            "main:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            loop="auto",
+            http="auto",
+            timeout_graceful_shutdown=_http_drain_timeout(args),
+        )
+        return
+
+    uvicorn.run(
+        _preload() if args.preload else "main:app",
+        host=args.host,
+        port=args.port,
+        loop="auto",
+        http="auto",
+        timeout_graceful_shutdown=_http_drain_timeout(args),
+    )
+
+if __name__ == "__main__":
+    main()
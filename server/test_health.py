@@ -0,0 +1,104 @@
+import signal
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from config import settings
+
+@pytest.fixture
+def app_state(monkeypatch):
+    monkeypatch.setattr(settings, "job_scheduler_enabled", False)
+    monkeypatch.setattr(settings, "database_retry_seconds", 0.01)
+    monkeypatch.setattr(settings, "health_check_interval_seconds", 0)
+    monkeypatch.setattr(main, "init_db", lambda: None)
+    monkeypatch.setattr(main, "check_database", lambda: True)
+    monkeypatch.setattr(main, "dispose_engine", lambda: None)
+    monkeypatch.setattr(main, "server_state", {"ready": False, "draining": False, "in_flight": 0, "startup_seconds": None})
+    monkeypatch.setattr(main, "_database_status", {"ok": False, "checked_at": None, "checking": False})
+    return main.server_state
+
+def _wait_until_ready(timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not main.server_state["ready"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_liveness_does_not_depend_on_database(app_state, monkeypatch):
+    monkeypatch.setattr(main, "check_database", lambda: False)
+    with TestClient(main.app) as client:
+        assert client.get("/api/health/live").json() == {"status": "alive"}
+
+def test_ready_after_initialization(app_state):
+    with TestClient(main.app) as client:
+        _wait_until_ready()
+        response = client.get("/api/health/ready")
+        assert response.status_code == 200
+        assert response.json()["database"] is True
+        assert response.json()["startup_seconds"] is not None
+
+def test_not_ready_before_initialization(app_state, monkeypatch):
+    def unreachable():
+        raise ConnectionError("database unreachable")
+
+    monkeypatch.setattr(main, "init_db", unreachable)
+    with TestClient(main.app) as client:
+        response = client.get("/api/health/ready")
+        assert response.status_code == 503
+        assert response.json()["startup_seconds"] is None
+
+def test_not_ready_when_database_is_down(app_state, monkeypatch):
+    with TestClient(main.app) as client:
+        _wait_until_ready()
+        monkeypatch.setattr(main, "check_database", lambda: False)
+        response = client.get("/api/health/ready")
+        assert response.status_code == 503
+        assert response.json()["database"] is False
+
+def test_not_ready_while_draining(app_state):
+    with TestClient(main.app) as client:
+        _wait_until_ready()
+        app_state["draining"] = True
+        response = client.get("/api/health/ready")
+        assert response.status_code == 503
+        assert response.json()["draining"] is True
+
+def test_database_check_is_cached(app_state, monkeypatch):
+    calls = []
+
+    def check():
+        calls.append(1)
+        return True
+
+    monkeypatch.setattr(main, "check_database", check)
+    monkeypatch.setattr(settings, "health_check_interval_seconds", 60)
+    with TestClient(main.app) as client:
+        for _ in range(3):
+            assert client.get("/api/health/ready").json()["database"] is True
+    assert len(calls) == 1
+
+def test_initialize_retries_until_database_is_up(app_state, monkeypatch):
+    attempts = []
+
+    def flaky_init():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("database unreachable")
+
+    monkeypatch.setattr(main, "init_db", flaky_init)
+    with TestClient(main.app) as client:
+        _wait_until_ready()
+        assert client.get("/api/health/ready").status_code == 200
+    assert len(attempts) == 3
+
+def test_sigterm_marks_draining_and_chains_previous_handler(app_state):
+    received = []
+    original = signal.signal(signal.SIGTERM, lambda signum, frame: received.append(signum))
+    try:
+        main._mark_draining_on_sigterm()
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+    finally:
+        signal.signal(signal.SIGTERM, original)
+
+    assert app_state["draining"] is True
+    assert received == [signal.SIGTERM]
@@ -0,0 +1,106 @@
+import pytest
+from pydantic import ValidationError
+
+from config import Settings, settings
+from job_handlers import ordered_job_nodes, runnable_job_nodes
+from jobs import retry_delay
+
+def _node(node_id, node_type, **properties):
+    return {"id": node_id, "data": {"nodeType": node_type, "properties": properties}}
+
+def _exec_edge(source, target):
+    return {"source": source, "target": target, "sourceHandle": "exec-out", "targetHandle": "exec-in"}
+
+# Mirrors initialNodes/initialEdges in ui/src/components/JobEditor/JobEditor.tsx
+DEFAULT_UI_GRAPH = {
+    "nodes": [
+        _node("1", "start"),
+        _node("2", "email", to="user@example.com", subject="Welcome!", body="Thank you for signing up!"),
+    ],
+    "edges": [_exec_edge("1", "2")],
+}
+
+@pytest.fixture
+def smtp(monkeypatch):
+    monkeypatch.setattr(settings, "smtp_host", "localhost")
+    monkeypatch.setattr(settings, "smtp_from", "widget@example.com")
+
+def test_default_ui_graph_order():
+    assert [node["id"] for node in ordered_job_nodes(DEFAULT_UI_GRAPH)] == ["1", "2"]
+
+def test_default_ui_graph_is_runnable(smtp):
+    assert [node["data"]["nodeType"] for node in runnable_job_nodes(DEFAULT_UI_GRAPH)] == ["start", "email"]
+
+def test_email_without_smtp_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "smtp_host", "")
+    with pytest.raises(ValueError, match="SMTP"):
+        runnable_job_nodes(DEFAULT_UI_GRAPH)
+
+def test_entry_is_node_without_incoming_exec_edge():
+    graph = {
+        "nodes": [_node("b", "delay"), _node("c", "delay"), _node("a", "start")],
+        "edges": [_exec_edge("b", "c"), _exec_edge("a", "b")],
+    }
+    assert [node["id"] for node in ordered_job_nodes(graph)] == ["a", "b", "c"]
+
+def test_data_edges_do_not_affect_order():
+    graph = {
+        "nodes": [_node("1", "start"), _node("2", "delay")],
+        "edges": [{"source": "2", "target": "1", "sourceHandle": "success-out", "targetHandle": "to-in"}],
+    }
+    assert [node["id"] for node in ordered_job_nodes(graph)] == ["1", "2"]
+
+def test_cycle_without_entry_has_no_nodes():
+    graph = {
+        "nodes": [_node("1", "delay"), _node("2", "delay")],
+        "edges": [_exec_edge("1", "2"), _exec_edge("2", "1")],
+    }
+    assert ordered_job_nodes(graph) == []
+    with pytest.raises(ValueError, match="no runnable nodes"):
+        runnable_job_nodes(graph)
+
+def test_cycle_after_entry_stops():
+    graph = {
+        "nodes": [_node("1", "start"), _node("2", "delay"), _node("3", "delay")],
+        "edges": [_exec_edge("1", "2"), _exec_edge("2", "3"), _exec_edge("3", "2")],
+    }
+    assert [node["id"] for node in ordered_job_nodes(graph)] == ["1", "2", "3"]
+
+@pytest.mark.parametrize("payload", [None, {}, {"nodes": [], "edges": []}])
+def test_empty_payload_is_rejected(payload):
+    with pytest.raises(ValueError, match="no runnable nodes"):
+        runnable_job_nodes(payload)
+
+def test_unsupported_node_type_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported node type 'sms'"):
+        runnable_job_nodes({"nodes": [_node("1", "start"), _node("2", "sms")], "edges": [_exec_edge("1", "2")]})
+
+@pytest.mark.parametrize("payload", [
+    {"nodes": [{"data": {"nodeType": "start"}}]},
+    {"nodes": [{"id": "1", "data": None}]},
+    {"nodes": [{"id": "1", "data": {"nodeType": "delay", "properties": None}}]},
+    {"nodes": "abc"},
+    {"nodes": [_node("1", "start")], "edges": [{"target": "1"}]},
+    {"nodes": [_node("1", "start"), _node("1", "delay")]},
+    ["not", "an", "object"],
+])
+def test_malformed_payload_is_rejected(payload):
+    with pytest.raises(ValueError):
+        runnable_job_nodes(payload)
+
+def test_exec_fan_out_is_rejected():
+    graph = {
+        "nodes": [_node("1", "start"), _node("2", "delay"), _node("3", "delay")],
+        "edges": [_exec_edge("1", "2"), _exec_edge("1", "3")],
+    }
+    with pytest.raises(ValueError, match="more than one execution output"):
+        ordered_job_nodes(graph)
+
+def test_unknown_job_executor_is_rejected():
+    with pytest.raises(ValidationError):
+        Settings(job_executor="proces")
+
+def test_retry_delay_backs_off_and_caps(monkeypatch):
+    monkeypatch.setattr(settings, "job_retry_backoff_seconds", 5.0)
+    monkeypatch.setattr(settings, "job_retry_backoff_max_seconds", 30.0)
+    assert [retry_delay(attempts) for attempts in range(1, 6)] == [5.0, 10.0, 20.0, 30.0, 30.0]